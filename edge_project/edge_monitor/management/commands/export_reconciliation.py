@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from edge_monitor.models import LocationSettings, NVRPlaybackEvent
+from edge_monitor.services.reconciliation import iter_reconciliation_ndjson, parse_cursor, parse_timestamp
+
+
+class Command(BaseCommand):
+    help = 'Stream playback event state as NDJSON for reconciliation with the central server.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--location', help='Restrict the export to one location identifier')
+        parser.add_argument(
+            '--status',
+            action='append',
+            dest='statuses',
+            choices=[choice for choice, _ in NVRPlaybackEvent.STATUS_CHOICES],
+            help='Transfer status to include (repeatable)',
+        )
+        parser.add_argument('--start', help='Inclusive ISO recording start lower bound (UTC)')
+        parser.add_argument('--end', help='Exclusive ISO recording start upper bound (UTC)')
+        parser.add_argument('--after', help='Resume after the cursor of a previously exported record')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows fetched per keyset page')
+        parser.add_argument('--output', help='Write NDJSON to this file instead of stdout')
+
+    def handle(self, *args: Any, **options: Any):  # type: ignore[override]
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        try:
+            filters = {
+                'location': LocationSettings.load_for_location(options['location']) if options.get('location') else None,
+                'statuses': options.get('statuses'),
+                'start_time': parse_timestamp(options['start']) if options.get('start') else None,
+                'end_time': parse_timestamp(options['end']) if options.get('end') else None,
+                'after': parse_cursor(options['after']) if options.get('after') else None,
+                'batch_size': options['batch_size'],
+            }
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        exported = 0
+        output = open(options['output'], 'w', encoding='utf-8') if options.get('output') else None
+        try:
+            for line in iter_reconciliation_ndjson(**filters):
+                if output is not None:
+                    output.write(line)
+                else:
+                    self.stdout.write(line, ending='')
+                exported += 1
+        finally:
+            if output is not None:
+                output.close()
+        self.stderr.write(self.style.SUCCESS(f'Exported {exported} events.'))
@@ -1,22 +1,56 @@
 from __future__ import annotations
 
 from django.conf import settings
-from django.core.management.base import BaseCommand, CommandParser
+from django.core.management.base import BaseCommand, CommandError, CommandParser
 
-from edge_monitor.models import LocationSettings
-from edge_monitor.services.scheduling import send_heartbeat
+from edge_monitor.models import LocationHealthSummary, LocationSettings
+from edge_monitor.services.scheduling import send_batched_heartbeats, send_heartbeat
 
 
 class Command(BaseCommand):
     help = 'Send heartbeat payloads to the central server.'
 
     def add_arguments(self, parser: CommandParser) -> None:
-        parser.add_argument('--location', required=True, help='Location identifier to heartbeat')
+        parser.add_argument(
+            '--location',
+            action='append',
+            dest='locations',
+            help='Location identifier to heartbeat (repeatable)',
+        )
+        parser.add_argument('--all', action='store_true', help='Heartbeat every active location')
+        parser.add_argument(
+            '--batch',
+            action='store_true',
+            help='Send one POST per API key to EDGE_HEARTBEAT_BATCH_URL instead of one per location',
+        )
+        parser.add_argument(
+            '--rebuild-summary',
+            action='store_true',
+            help='Recount cached health summaries from playback events before sending',
+        )
 
     def handle(self, *args, **options):  # type: ignore[override]
-        location_id: str = options['location']
-        location = LocationSettings.load_for_location(location_id)
-        self.stdout.write(self.style.NOTICE(f'Sending heartbeat for {location.location_id}'))
-        send_heartbeat(location)
+        location_ids: list[str] | None = options.get('locations')
+        if options['all']:
+            locations = list(LocationSettings.objects.filter(is_active=True))
+        elif location_ids:
+            locations = [LocationSettings.load_for_location(location_id) for location_id in location_ids]
+        else:
+            raise CommandError('Provide --location or --all.')
+
+        if options['batch'] and not settings.EDGE_HEARTBEAT_BATCH_URL:
+            raise CommandError('--batch requires EDGE_HEARTBEAT_BATCH_URL to be configured.')
+
+        if options['rebuild_summary']:
+            for location in locations:
+                LocationHealthSummary.rebuild(location.pk)
+
+        if options['batch']:
+            self.stdout.write(self.style.NOTICE(f'Sending batched heartbeats for {len(locations)} locations'))
+            send_batched_heartbeats(locations)
+        else:
+            for location in locations:
+                self.stdout.write(self.style.NOTICE(f'Sending heartbeat for {location.location_id}'))
+                send_heartbeat(location)
         self.stdout.write(self.style.SUCCESS('Heartbeat dispatched.'))
         self.stdout.write(self.style.NOTICE(f'Heartbeat interval is {settings.EDGE_HEARTBEAT_INTERVAL_SECONDS}s'))
@@ -4,7 +4,8 @@ from datetime import datetime
 from typing import Any
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Min, OuterRef, Q, Subquery, Sum, Value, When
 
 
 class LocationSettings(models.Model):
@@ -69,11 +70,60 @@ class NVRPlaybackEvent(models.Model):
         indexes = [
             models.Index(fields=['central_transfer_status']),
             models.Index(fields=['location', 'camera_channel']),
+            models.Index(fields=['location', 'central_transfer_status', 'metadata_retrieved_at']),
+            models.Index(fields=['recording_start', 'id']),
+            models.Index(fields=['location', 'recording_start', 'id']),
         ]
 
     def __str__(self) -> str:  # pragma: no cover - human readable
         return f"Event {self.event_id} ({self.camera_channel})"
 
+    def _locked_health_state(self) -> tuple[int, str, int] | None:
+        """Read the stored ``(location_id, status, file_size)`` under a row lock; call inside a transaction."""
+
+        if self._state.adding:
+            return None
+        row = (
+            type(self)._base_manager.select_for_update()
+            .filter(pk=self.pk)
+            .values_list('location_id', 'central_transfer_status', 'file_size')
+            .first()
+        )
+        if row is None:
+            return None
+        return row[0], row[1], row[2] or 0
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Persist the event and keep the location health summaries in step with status changes."""
+
+        update_fields = kwargs.get('update_fields')
+        tracked = {'location', 'location_id', 'central_transfer_status', 'file_size'}
+        if update_fields is not None and not tracked & set(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            # Always diff against the stored row: this instance may be stale.
+            previous = self._locked_health_state()
+            if update_fields is None or previous is None:
+                current = (self.location_id, self.central_transfer_status, self.file_size or 0)
+            else:
+                saved = set(update_fields)
+                current = (
+                    self.location_id if saved & {'location', 'location_id'} else previous[0],
+                    self.central_transfer_status if 'central_transfer_status' in saved else previous[1],
+                    (self.file_size or 0) if 'file_size' in saved else previous[2],
+                )
+            super().save(*args, **kwargs)
+            LocationHealthSummary.record_transition(self, previous, current)
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        with transaction.atomic():
+            previous = self._locked_health_state()
+            result = super().delete(*args, **kwargs)
+            LocationHealthSummary.record_transition(self, previous, None)
+        return result
+
     @property
     def duration_seconds(self) -> float:
         delta = self.recording_end - self.recording_start
@@ -122,3 +172,180 @@ class NVRPlaybackEvent(models.Model):
             'transfer_attempts': self.transfer_attempts,
             'status': self.central_transfer_status,
         }
+
+
+class LocationHealthSummary(models.Model):
+    """Per-location transfer health counters maintained as events change status.
+
+    Heartbeats read this row instead of counting ``NVRPlaybackEvent`` rows. Bulk
+    ``QuerySet.update()``/``delete()`` calls bypass the bookkeeping; use
+    :meth:`rebuild` afterwards to recount from scratch.
+    """
+
+    STATUS_COUNTER_FIELDS = {
+        NVRPlaybackEvent.STATUS_PENDING: 'pending_count',
+        NVRPlaybackEvent.STATUS_IN_PROGRESS: 'in_progress_count',
+        NVRPlaybackEvent.STATUS_COMPLETE: 'complete_count',
+        NVRPlaybackEvent.STATUS_FAILED: 'failed_count',
+    }
+
+    location = models.OneToOneField(LocationSettings, on_delete=models.CASCADE, related_name='health_summary')
+    pending_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    complete_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    backlog_bytes = models.BigIntegerField(default=0, help_text='Reported bytes of events not yet transferred')
+    oldest_pending_at = models.DateTimeField(null=True, blank=True)
+    completed_since_heartbeat = models.IntegerField(default=0)
+    completed_bytes_since_heartbeat = models.BigIntegerField(default=0)
+    last_heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['location']
+
+    def __str__(self) -> str:  # pragma: no cover - human readable
+        return f"Health summary for {self.location_id}"
+
+    @classmethod
+    def _oldest_pending_subquery(cls) -> Subquery:
+        return Subquery(
+            NVRPlaybackEvent.objects.filter(
+                location_id=OuterRef('location_id'),
+                central_transfer_status=NVRPlaybackEvent.STATUS_PENDING,
+            )
+            .order_by('metadata_retrieved_at')
+            .values('metadata_retrieved_at')[:1]
+        )
+
+    @classmethod
+    def record_transition(
+        cls,
+        event: NVRPlaybackEvent,
+        previous: tuple[int, str, int] | None,
+        current: tuple[int, str, int] | None,
+    ) -> None:
+        """Apply the counter deltas for ``event`` moving from ``previous`` to ``current``.
+
+        Each state is ``(location_id, status, file_size)``; ``None`` means the
+        event did not exist before (creation) or no longer exists (deletion).
+        An event that changes location is removed from the old location's
+        summary and added to the new one.
+        """
+
+        if previous == current:
+            return
+
+        completed = (
+            current is not None
+            and current[1] == NVRPlaybackEvent.STATUS_COMPLETE
+            and (previous is None or previous[1] != current[1])
+        )
+        queued_at = event.metadata_retrieved_at
+        if previous is not None and current is not None and previous[0] != current[0]:
+            cls._apply_transition(previous[0], previous[1:], None, queued_at=queued_at, completed=False)
+            cls._apply_transition(current[0], None, current[1:], queued_at=queued_at, completed=completed)
+        else:
+            location_id = (current or previous)[0]  # type: ignore[index]
+            cls._apply_transition(
+                location_id,
+                previous[1:] if previous else None,
+                current[1:] if current else None,
+                queued_at=queued_at,
+                completed=completed,
+            )
+
+    @classmethod
+    def _apply_transition(
+        cls,
+        location_id: int,
+        previous: tuple[str, int] | None,
+        current: tuple[str, int] | None,
+        *,
+        queued_at: datetime,
+        completed: bool,
+    ) -> None:
+        deltas: dict[str, int] = {}
+        for state, sign in ((previous, -1), (current, 1)):
+            if state is None:
+                continue
+            status, size = state
+            counter = cls.STATUS_COUNTER_FIELDS[status]
+            deltas[counter] = deltas.get(counter, 0) + sign
+            if status != NVRPlaybackEvent.STATUS_COMPLETE:
+                deltas['backlog_bytes'] = deltas.get('backlog_bytes', 0) + sign * size
+
+        updates: dict[str, Any] = {name: F(name) + delta for name, delta in deltas.items() if delta}
+
+        if completed:
+            updates['completed_since_heartbeat'] = F('completed_since_heartbeat') + 1
+            updates['completed_bytes_since_heartbeat'] = F('completed_bytes_since_heartbeat') + current[1]  # type: ignore[index]
+
+        previous_status = previous[0] if previous else None
+        current_status = current[0] if current else None
+        pending = NVRPlaybackEvent.STATUS_PENDING
+        if current_status == pending and previous_status != pending:
+            updates['oldest_pending_at'] = Case(
+                When(Q(oldest_pending_at__isnull=True) | Q(oldest_pending_at__gt=queued_at), then=Value(queued_at)),
+                default=F('oldest_pending_at'),
+                output_field=models.DateTimeField(),
+            )
+
+        if not updates:
+            return
+
+        summaries = cls.objects.filter(location_id=location_id)
+        if not summaries.update(**updates):
+            cls.rebuild(location_id)
+            return
+
+        if previous_status == pending and current_status != pending:
+            # Only recompute the oldest pending timestamp when the departing event held it.
+            summaries.filter(oldest_pending_at__gte=queued_at).update(oldest_pending_at=cls._oldest_pending_subquery())
+
+    @classmethod
+    def rebuild(cls, location_id: int) -> 'LocationHealthSummary':
+        """Recount the summary for a location from its playback events."""
+
+        events = NVRPlaybackEvent.objects.filter(location_id=location_id)
+        defaults: dict[str, Any] = {name: 0 for name in cls.STATUS_COUNTER_FIELDS.values()}
+        defaults['backlog_bytes'] = 0
+        rows = events.order_by().values('central_transfer_status').annotate(total=Count('id'), size=Sum('file_size'))
+        for row in rows:
+            status = row['central_transfer_status']
+            defaults[cls.STATUS_COUNTER_FIELDS[status]] = row['total']
+            if status != NVRPlaybackEvent.STATUS_COMPLETE:
+                defaults['backlog_bytes'] += row['size'] or 0
+        defaults['oldest_pending_at'] = events.filter(
+            central_transfer_status=NVRPlaybackEvent.STATUS_PENDING
+        ).aggregate(oldest=Min('metadata_retrieved_at'))['oldest']
+        summary, _ = cls.objects.update_or_create(location_id=location_id, defaults=defaults)
+        return summary
+
+    def status_counts(self) -> dict[str, int]:
+        return {status: getattr(self, field) for status, field in self.STATUS_COUNTER_FIELDS.items()}
+
+    def to_payload(self, *, now: datetime) -> dict[str, Any]:
+        oldest_pending_age = None
+        if self.oldest_pending_at is not None:
+            oldest_pending_age = max((now - self.oldest_pending_at).total_seconds(), 0.0)
+        window_start = self.last_heartbeat_at or self.created_at
+        return {
+            'status_counts': self.status_counts(),
+            'oldest_pending_age_seconds': oldest_pending_age,
+            'backlog_bytes': self.backlog_bytes,
+            'throughput': {
+                'window_seconds': max((now - window_start).total_seconds(), 0.0),
+                'completed_events': self.completed_since_heartbeat,
+                'completed_bytes': self.completed_bytes_since_heartbeat,
+            },
+        }
+
+    def acknowledge_heartbeat(self, *, now: datetime) -> None:
+        """Start a new throughput window, keeping completions recorded since this row was read."""
+
+        type(self).objects.filter(pk=self.pk).update(
+            completed_since_heartbeat=F('completed_since_heartbeat') - self.completed_since_heartbeat,
+            completed_bytes_since_heartbeat=F('completed_bytes_since_heartbeat') - self.completed_bytes_since_heartbeat,
+            last_heartbeat_at=now,
+        )
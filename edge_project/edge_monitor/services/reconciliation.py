@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
+
+from django.db import models
+from django.db.models import Q
+
+from edge_monitor.models import LocationSettings, NVRPlaybackEvent
+
+logger = logging.getLogger(__name__)
+
+RECONCILIATION_FIELDS = (
+    'id',
+    'event_id',
+    'location__location_id',
+    'camera_channel',
+    'recording_start',
+    'recording_end',
+    'file_path',
+    'file_size',
+    'transfer_attempts',
+    'central_transfer_status',
+)
+
+
+def format_cursor(event: NVRPlaybackEvent) -> str:
+    # UTC with a ``Z`` suffix keeps the cursor safe to paste into a query string.
+    start = event.recording_start.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    return f'{start}|{event.pk}'
+
+
+def parse_cursor(value: str) -> tuple[datetime, int]:
+    """Parse a ``<recording_start ISO>|<id>`` cursor emitted by :func:`format_cursor`."""
+
+    start_text, separator, pk_text = value.rpartition('|')
+    if not separator:
+        raise ValueError(f'Invalid reconciliation cursor: {value!r}')
+    return parse_timestamp(start_text), int(pk_text)
+
+
+def parse_timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def reconciliation_queryset(
+    *,
+    location: LocationSettings | None = None,
+    statuses: Iterable[str] | None = None,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+) -> models.QuerySet[NVRPlaybackEvent]:
+    queryset = NVRPlaybackEvent.objects.select_related('location').only(*RECONCILIATION_FIELDS)
+    if location is not None:
+        queryset = queryset.filter(location=location)
+    if statuses:
+        queryset = queryset.filter(central_transfer_status__in=list(statuses))
+    if start_time is not None:
+        queryset = queryset.filter(recording_start__gte=start_time)
+    if end_time is not None:
+        queryset = queryset.filter(recording_start__lt=end_time)
+    return queryset.order_by('recording_start', 'id')
+
+
+def iter_reconciliation_events(
+    *,
+    location: LocationSettings | None = None,
+    statuses: Iterable[str] | None = None,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    batch_size: int = 2000,
+) -> Iterator[NVRPlaybackEvent]:
+    """Yield matching events ordered by ``(recording_start, id)``, one keyset page at a time.
+
+    Each page is a bounded query resuming after the last row seen, so memory use
+    and per-query cost stay flat however large the table grows.
+    """
+
+    queryset = reconciliation_queryset(
+        location=location,
+        statuses=statuses,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    cursor = after
+    while True:
+        page = queryset
+        if cursor is not None:
+            last_start, last_pk = cursor
+            page = page.filter(Q(recording_start__gt=last_start) | Q(recording_start=last_start, id__gt=last_pk))
+        count = 0
+        for event in page[:batch_size].iterator(chunk_size=batch_size):
+            count += 1
+            cursor = (event.recording_start, event.pk)
+            yield event
+        if count < batch_size:
+            return
+
+
+def iter_reconciliation_ndjson(**filters: Any) -> Iterator[str]:
+    """Yield one newline-terminated JSON document per event, with a resumable ``cursor``."""
+
+    for event in iter_reconciliation_events(**filters):
+        record = event.to_payload()
+        record['cursor'] = format_cursor(event)
+        yield json.dumps(record, separators=(',', ':')) + '\n'
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Any, Iterable
 
 import requests
 from django.conf import settings
 
-from edge_monitor.models import LocationSettings, NVRPlaybackEvent
+from edge_monitor.models import LocationHealthSummary, LocationSettings, NVRPlaybackEvent
 from edge_monitor.services.nvr_client import HikvisionNVRClient
 from edge_monitor.services.transfer import TransferResult, upload_recording_to_central
 
@@ -66,21 +66,78 @@ def transfer_pending_events(location: LocationSettings, *, limit: int | None = N
         yield upload_recording_to_central(event=event, location_settings=location, nvr_client=client)
 
 
-def send_heartbeat(location: LocationSettings) -> None:
+def load_health_summaries(locations: Iterable[LocationSettings]) -> dict[int, LocationHealthSummary]:
+    """Fetch cached health summaries in one query, rebuilding any that are missing."""
+
+    locations = list(locations)
+    summaries = {
+        summary.location_id: summary
+        for summary in LocationHealthSummary.objects.filter(location__in=locations)
+    }
+    for location in locations:
+        if location.pk not in summaries:
+            logger.info('Rebuilding health summary for %s', location.location_id)
+            summaries[location.pk] = LocationHealthSummary.rebuild(location.pk)
+    return summaries
+
+
+def build_heartbeat_payload(location: LocationSettings, summary: LocationHealthSummary, *, now: datetime) -> dict[str, Any]:
     payload = {
         'location_id': location.location_id,
-        'timestamp': datetime.now(timezone.utc).isoformat(),
-        'failed_events': location.playback_events.filter(
-            central_transfer_status=NVRPlaybackEvent.STATUS_FAILED
-        ).count(),
+        'timestamp': now.isoformat(),
+        'failed_events': summary.failed_count,
     }
+    payload.update(summary.to_payload(now=now))
+    return payload
+
+
+def _post_heartbeat(url: str, api_key: str, payload: dict[str, Any], label: str) -> bool:
     headers = {
-        'X-API-Key': location.central_server_api_key,
+        'X-API-Key': api_key,
         'Content-Type': 'application/json',
     }
     try:
-        response = requests.post(location.heartbeat_url, json=payload, headers=headers, timeout=10)
+        response = requests.post(url, json=payload, headers=headers, timeout=10)
         response.raise_for_status()
-        logger.debug('Heartbeat sent for %s', location.location_id)
+        logger.debug('Heartbeat sent for %s', label)
+        return True
     except Exception as exc:  # pragma: no cover - network failure
-        logger.exception('Failed heartbeat for %s: %s', location.location_id, exc)
+        logger.exception('Failed heartbeat for %s: %s', label, exc)
+        return False
+
+
+def send_heartbeat(location: LocationSettings) -> None:
+    now = datetime.now(timezone.utc)
+    summary = load_health_summaries([location])[location.pk]
+    payload = build_heartbeat_payload(location, summary, now=now)
+    if _post_heartbeat(location.heartbeat_url, location.central_server_api_key, payload, location.location_id):
+        summary.acknowledge_heartbeat(now=now)
+
+
+def send_batched_heartbeats(locations: Iterable[LocationSettings], *, batch_url: str | None = None) -> None:
+    """Send one heartbeat POST per API key to the batch endpoint, covering every location using it.
+
+    Batches go to ``EDGE_HEARTBEAT_BATCH_URL`` rather than the per-location
+    ``heartbeat_url``, which only accepts single-location payloads.
+    """
+
+    url = batch_url or settings.EDGE_HEARTBEAT_BATCH_URL
+    if not url:
+        raise ValueError('EDGE_HEARTBEAT_BATCH_URL is not configured')
+
+    locations = list(locations)
+    now = datetime.now(timezone.utc)
+    summaries = load_health_summaries(locations)
+    groups: dict[str, list[LocationSettings]] = {}
+    for location in locations:
+        groups.setdefault(location.central_server_api_key, []).append(location)
+
+    for api_key, members in groups.items():
+        payload = {
+            'timestamp': now.isoformat(),
+            'heartbeats': [build_heartbeat_payload(location, summaries[location.pk], now=now) for location in members],
+        }
+        label = ', '.join(location.location_id for location in members)
+        if _post_heartbeat(url, api_key, payload, label):
+            for location in members:
+                summaries[location.pk].acknowledge_heartbeat(now=now)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from edge_monitor.models import LocationHealthSummary, LocationSettings, NVRPlaybackEvent
+from edge_monitor.services.scheduling import send_batched_heartbeats
+
+RECORDING_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_location(location_id: str = 'HQ', api_key: str = 'secret') -> LocationSettings:
+    return LocationSettings.objects.create(
+        location_id=location_id,
+        nvr_endpoint='http://nvr.local',
+        nvr_username='admin',
+        nvr_password='password',
+        central_server_upload_url='http://central.local/upload',
+        central_server_api_key=api_key,
+        heartbeat_url='http://central.local/heartbeat',
+    )
+
+
+def make_event(location: LocationSettings, event_id: str, *, file_size: int = 100) -> NVRPlaybackEvent:
+    return NVRPlaybackEvent.objects.create(
+        event_id=event_id,
+        location=location,
+        camera_channel='1',
+        recording_start=RECORDING_START,
+        recording_end=RECORDING_START + timedelta(seconds=30),
+        file_path=f'/tracks/{event_id}.mp4',
+        file_size=file_size,
+        nvr_url=f'http://nvr.local/tracks/{event_id}.mp4',
+    )
+
+
+class LocationHealthSummaryTests(TestCase):
+    def setUp(self) -> None:
+        self.location = make_location()
+
+    def summary(self, location: LocationSettings | None = None) -> LocationHealthSummary:
+        return LocationHealthSummary.objects.get(location=location or self.location)
+
+    def assertMatchesRebuild(self, location: LocationSettings | None = None) -> None:
+        location = location or self.location
+        incremental = self.summary(location)
+        rebuilt = LocationHealthSummary.rebuild(location.pk)
+        self.assertEqual(incremental.status_counts(), rebuilt.status_counts())
+        self.assertEqual(incremental.backlog_bytes, rebuilt.backlog_bytes)
+        self.assertEqual(incremental.oldest_pending_at, rebuilt.oldest_pending_at)
+
+    def test_status_transitions_update_counters(self) -> None:
+        first = make_event(self.location, 'a', file_size=100)
+        second = make_event(self.location, 'b', file_size=200)
+        summary = self.summary()
+        self.assertEqual(summary.pending_count, 2)
+        self.assertEqual(summary.backlog_bytes, 300)
+        self.assertEqual(summary.oldest_pending_at, first.metadata_retrieved_at)
+
+        first.mark_in_progress()
+        summary = self.summary()
+        self.assertEqual(summary.status_counts()[NVRPlaybackEvent.STATUS_IN_PROGRESS], 1)
+        self.assertEqual(summary.oldest_pending_at, second.metadata_retrieved_at)
+
+        first.increment_attempts()
+        first.mark_complete()
+        second.increment_attempts(failed=True, error='boom')
+        summary = self.summary()
+        self.assertEqual(
+            summary.status_counts(),
+            {'PENDING': 0, 'IN_PROGRESS': 0, 'COMPLETE': 1, 'FAILED': 1},
+        )
+        self.assertEqual(summary.backlog_bytes, 200)
+        self.assertIsNone(summary.oldest_pending_at)
+        self.assertEqual(summary.completed_since_heartbeat, 1)
+        self.assertEqual(summary.completed_bytes_since_heartbeat, 100)
+        self.assertMatchesRebuild()
+
+    def test_update_or_create_reset_to_pending(self) -> None:
+        event = make_event(self.location, 'a')
+        event.increment_attempts(failed=True, error='boom')
+
+        NVRPlaybackEvent.objects.update_or_create(
+            event_id='a',
+            defaults={'central_transfer_status': NVRPlaybackEvent.STATUS_PENDING, 'file_size': 150},
+        )
+        summary = self.summary()
+        self.assertEqual(summary.pending_count, 1)
+        self.assertEqual(summary.failed_count, 0)
+        self.assertEqual(summary.backlog_bytes, 150)
+        self.assertEqual(summary.oldest_pending_at, event.metadata_retrieved_at)
+        self.assertMatchesRebuild()
+
+    def test_delete_oldest_pending_event(self) -> None:
+        oldest = make_event(self.location, 'a')
+        newer = make_event(self.location, 'b')
+
+        oldest.delete()
+        summary = self.summary()
+        self.assertEqual(summary.pending_count, 1)
+        self.assertEqual(summary.backlog_bytes, 100)
+        self.assertEqual(summary.oldest_pending_at, newer.metadata_retrieved_at)
+        self.assertMatchesRebuild()
+
+    def test_event_moved_between_locations(self) -> None:
+        other = make_location('North')
+        make_event(other, 'existing', file_size=50)
+        make_event(self.location, 'a', file_size=10)
+
+        NVRPlaybackEvent.objects.update_or_create(event_id='a', defaults={'location': other})
+        summary = self.summary()
+        self.assertEqual(summary.pending_count, 0)
+        self.assertEqual(summary.backlog_bytes, 0)
+        self.assertIsNone(summary.oldest_pending_at)
+        self.assertEqual(self.summary(other).pending_count, 2)
+        self.assertEqual(self.summary(other).backlog_bytes, 60)
+        self.assertMatchesRebuild()
+        self.assertMatchesRebuild(other)
+
+    def test_stale_instances_do_not_double_count(self) -> None:
+        make_event(self.location, 'a')
+        make_event(self.location, 'b')
+        first_copy = NVRPlaybackEvent.objects.get(event_id='a')
+        second_copy = NVRPlaybackEvent.objects.get(event_id='a')
+
+        first_copy.mark_in_progress()
+        second_copy.mark_in_progress()
+        summary = self.summary()
+        self.assertEqual(summary.pending_count, 1)
+        self.assertEqual(summary.in_progress_count, 1)
+
+        failed_copy = NVRPlaybackEvent.objects.get(event_id='b')
+        failed_copy.mark_failed('boom')
+        NVRPlaybackEvent.objects.update_or_create(
+            event_id='b', defaults={'central_transfer_status': NVRPlaybackEvent.STATUS_PENDING}
+        )
+        failed_copy.mark_failed('boom again')
+        summary = self.summary()
+        self.assertEqual(summary.failed_count, 1)
+        self.assertEqual(summary.pending_count, 0)
+        self.assertMatchesRebuild()
+
+
+class BatchedHeartbeatTests(TestCase):
+    @override_settings(EDGE_HEARTBEAT_BATCH_URL='http://central.local/heartbeats/batch')
+    def test_batches_post_to_batch_url_per_api_key(self) -> None:
+        first = make_location('HQ')
+        second = make_location('North')
+        make_event(first, 'a')
+        with mock.patch('edge_monitor.services.scheduling.requests.post') as post:
+            send_batched_heartbeats([first, second])
+
+        post.assert_called_once()
+        self.assertEqual(post.call_args.args[0], 'http://central.local/heartbeats/batch')
+        heartbeats = post.call_args.kwargs['json']['heartbeats']
+        self.assertEqual([beat['location_id'] for beat in heartbeats], ['HQ', 'North'])
+        self.assertEqual(heartbeats[0]['status_counts']['PENDING'], 1)
+
+    @override_settings(EDGE_HEARTBEAT_BATCH_URL='')
+    def test_requires_batch_url(self) -> None:
+        with self.assertRaises(ValueError):
+            send_batched_heartbeats([make_location()])
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from edge_monitor.models import LocationSettings, NVRPlaybackEvent
+
+RECORDING_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+EXPORT_URL = '/api/reconciliation/events/'
+
+
+class ReconciliationExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.location = LocationSettings.objects.create(
+            location_id='HQ',
+            nvr_endpoint='http://nvr.local',
+            nvr_username='admin',
+            nvr_password='password',
+            central_server_upload_url='http://central.local/upload',
+            central_server_api_key='secret',
+            heartbeat_url='http://central.local/heartbeat',
+        )
+        # Three events share each recording_start so page boundaries fall inside ties.
+        for index in range(10):
+            NVRPlaybackEvent.objects.create(
+                event_id=f'evt-{index}',
+                location=cls.location,
+                camera_channel='1',
+                recording_start=RECORDING_START + timedelta(minutes=index // 3),
+                recording_end=RECORDING_START + timedelta(minutes=index // 3, seconds=30),
+                file_path=f'/tracks/{index}.mp4',
+                file_size=100,
+                nvr_url=f'http://nvr.local/tracks/{index}.mp4',
+            )
+
+    def export(self, api_key: str = 'secret', **params: object):
+        return self.client.get(EXPORT_URL, {'location': 'HQ', **params}, HTTP_X_API_KEY=api_key)
+
+    def records(self, response) -> list[dict]:
+        body = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_command_query_count_is_flat_per_page(self) -> None:
+        stdout = io.StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('export_reconciliation', '--location', 'HQ', '--batch-size', '4', stdout=stdout, stderr=io.StringIO())
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([record['event_id'] for record in records], [f'evt-{index}' for index in range(10)])
+        self.assertEqual(records[0]['location_id'], 'HQ')
+        # One location lookup plus three keyset pages; no per-row location queries.
+        self.assertEqual(len(queries), 4)
+
+    def test_resume_after_cursor_within_tied_recording_start(self) -> None:
+        first_page = self.records(self.export(batch_size=4, status='PENDING'))
+        cursor = first_page[3]['cursor']
+        self.assertNotIn('+', cursor)
+
+        response = self.client.get(f'{EXPORT_URL}?location=HQ&batch_size=4&after={cursor}', HTTP_X_API_KEY='secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        resumed = self.records(response)
+        self.assertEqual([record['event_id'] for record in resumed], [f'evt-{index}' for index in range(4, 10)])
+
+    def test_invalid_filters_return_400(self) -> None:
+        self.assertEqual(self.export(status='BOGUS').status_code, 400)
+        self.assertEqual(self.export(start='not-a-date').status_code, 400)
+        self.assertEqual(self.export(after='not-a-cursor').status_code, 400)
+
+    def test_wrong_api_key_returns_403(self) -> None:
+        self.assertEqual(self.export(api_key='wrong').status_code, 403)
+        self.assertEqual(self.export(api_key='wröng').status_code, 403)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from edge_monitor import views
+
+app_name = 'edge_monitor'
+
+urlpatterns = [
+    path('reconciliation/events/', views.reconciliation_export, name='reconciliation-export'),
+]
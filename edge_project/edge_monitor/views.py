@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hmac
+
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from edge_monitor.models import LocationSettings, NVRPlaybackEvent
+from edge_monitor.services.reconciliation import iter_reconciliation_ndjson, parse_cursor, parse_timestamp
+
+MAX_RECONCILIATION_BATCH_SIZE = 10000
+
+
+@require_GET
+def reconciliation_export(request: HttpRequest) -> HttpResponse:
+    """Stream a location's playback event state as NDJSON for the central server.
+
+    Requires ``location`` and an ``X-API-Key`` header matching that location's
+    central API key. Optional filters: ``status`` (repeatable), ``start``/``end``
+    (ISO recording start bounds), ``after`` (cursor of the last record received)
+    and ``batch_size``.
+    """
+
+    location_id = request.GET.get('location')
+    if not location_id:
+        return HttpResponseBadRequest('location is required')
+    location = LocationSettings.objects.filter(location_id=location_id).first()
+    api_key = request.headers.get('X-API-Key', '')
+    if location is None or not hmac.compare_digest(api_key.encode(), location.central_server_api_key.encode()):
+        return HttpResponseForbidden('Invalid location or API key')
+
+    statuses = request.GET.getlist('status')
+    valid_statuses = {choice for choice, _ in NVRPlaybackEvent.STATUS_CHOICES}
+    if not set(statuses) <= valid_statuses:
+        return HttpResponseBadRequest('Unknown status filter')
+
+    try:
+        batch_size = int(request.GET.get('batch_size', 2000))
+        start_text = request.GET.get('start')
+        end_text = request.GET.get('end')
+        after_text = request.GET.get('after')
+        filters = {
+            'location': location,
+            'statuses': statuses,
+            'start_time': parse_timestamp(start_text) if start_text else None,
+            'end_time': parse_timestamp(end_text) if end_text else None,
+            'after': parse_cursor(after_text) if after_text else None,
+            'batch_size': min(max(batch_size, 1), MAX_RECONCILIATION_BATCH_SIZE),
+        }
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    return StreamingHttpResponse(iter_reconciliation_ndjson(**filters), content_type='application/x-ndjson')
@@ -83,4 +83,6 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Edge specific settings
 EDGE_HEARTBEAT_INTERVAL_SECONDS = int(os.environ.get('EDGE_HEARTBEAT_INTERVAL_SECONDS', '300'))
+# Central endpoint accepting multi-location heartbeat batches (send_heartbeat --batch)
+EDGE_HEARTBEAT_BATCH_URL = os.environ.get('EDGE_HEARTBEAT_BATCH_URL', '')
 EDGE_RETRY_LIMIT = int(os.environ.get('EDGE_RETRY_LIMIT', '5'))